@@ -1,8 +1,11 @@
+import multiprocessing
 import pygame
 import random
 import time
+from collections import deque
 from enum import Enum
 import numpy as np
+from snake_core import HAVE_CORE, SnakeCore
 
 
 class Direction(Enum):
@@ -12,14 +15,51 @@ class Direction(Enum):
     DOWN = 3
 
 
+# Every 12-bit state mask unpacked once, row i is the state vector of mask i
+_STATE_TABLE = np.unpackbits(
+    np.arange(1 << 12, dtype='<u2').view(np.uint8).reshape(-1, 2),
+    axis=1, count=12, bitorder='little'
+).view(np.int8)
+
+
+def unpack_states(bits):
+    """
+    Unpack a batch of states produced by SnakeGame.get_state_bits
+    (or step(action, packed=True)).
+    
+    Args:
+        bits (np.array): Packed states, shape (N,)
+    
+    Returns:
+        np.array: The state representations, shape (N, 12)
+    """
+    return _STATE_TABLE[np.asarray(bits)]
+
+
 class SnakeGame:
-    def __init__(self, width=640, height=480, grid_size=20, render=True):
+    # Lookup tables indexed by action / Direction.value: RIGHT, LEFT, UP, DOWN
+    _DIRECTIONS = (Direction.RIGHT, Direction.LEFT, Direction.UP, Direction.DOWN)
+    _DELTAS = ((1, 0), (-1, 0), (0, -1), (0, 1))
+    _OPPOSITE = (1, 0, 3, 2)
+
+    # Uniform draws fetched from the generator at once for food placement
+    _RANDOM_BLOCK = 256
+
+    def __init__(self, width=640, height=480, grid_size=20, render=True, render_every=1, fps=30,
+                 seed=None, use_core=True):
         self.width = width
         self.height = height
         self.grid_size = grid_size
         self.grid_width = self.width // self.grid_size
         self.grid_height = self.height // self.grid_size
         self.render = render
+        # Only draw and process window events every k-th step; larger values
+        # trade visual smoothness for roughly k times faster rendered training
+        if render_every < 1:
+            raise ValueError(f"render_every must be at least 1, got {render_every}")
+        self.render_every = render_every
+        # Frame rate cap for rendered steps; 0 renders as fast as possible
+        self.fps = fps
 
         # initialize pygame rendering if enabled
         if self.render:
@@ -28,6 +68,46 @@ class SnakeGame:
             pygame.display.set_caption("Snake")
             self.clock = pygame.time.Clock()
 
+            # Fonts are expensive to load, so create them once
+            self._font_score = pygame.font.SysFont('arial', 25)
+            self._font_over = pygame.font.SysFont('arial', 50)
+            self._font_final = pygame.font.SysFont('arial', 30)
+            self._font_restart = pygame.font.SysFont('arial', 25)
+
+            # Prerendered tiles, blitted once per segment instead of drawing rects
+            self._snake_tile = pygame.Surface((self.grid_size, self.grid_size))
+            self._snake_tile.fill((0, 255, 0))  # Green snake
+            pygame.draw.rect(
+                self._snake_tile, (0, 200, 0),  # Darker green border
+                self._snake_tile.get_rect(), 1
+            )
+            self._food_tile = pygame.Surface((self.grid_size, self.grid_size))
+            self._food_tile.fill((255, 0, 0))  # Red food
+
+            # Rendered score text, refreshed only when the score changes
+            self._last_score = None
+            self._score_surface = None
+
+            # Last drawn frame, used to redraw only the cells that changed
+            self._drawn_frame = None
+            self._drawn_tail = None
+            self._drawn_length = 0
+
+        # Per-game generator, so games in forked worker processes don't share
+        # the random module's state; pass a seed to reproduce a game
+        self._rng = np.random.default_rng(seed)
+        self._uniforms = []
+
+        # Headless games run the step logic through the compiled core when
+        # available (unless use_core is False), seeded from this game's generator
+        self._core = None
+        if not self.render and use_core and HAVE_CORE:
+            core_seed = int(self._rng.integers(2**63))
+            self._core = SnakeCore(self.grid_width, self.grid_height, core_seed)
+
+        # Occupancy grid (row = y, column = x) for O(1) body lookups
+        self.occupied = np.zeros((self.grid_height, self.grid_width), dtype=np.uint8)
+
         # initialize game state
         self.reset()
 
@@ -40,18 +120,36 @@ class SnakeGame:
         self.snake_direction = Direction.RIGHT
         
         # Initial snake position (head at center, body to the left)
-        self.head = [self.grid_width // 2, self.grid_height // 2]
-        
-        # snake is a list of positions, starting with the head
-        self.snake = [
-            self.head.copy(),
-            [self.head[0] - 1, self.head[1]],
-            [self.head[0] - 2, self.head[1]]
-        ]
+        self.hx = self.grid_width // 2
+        self.hy = self.grid_height // 2
+        
+        # snake is a deque of (x, y) positions, starting with the head
+        self.snake = deque([
+            (self.hx, self.hy),
+            (self.hx - 1, self.hy),
+            (self.hx - 2, self.hy)
+        ])
+        
+        # Clear the occupancy grid in place, it may be shared (see VecSnakeEnv)
+        self.occupied.fill(0)
+        
+        if self._core is None:
+            # Free cells (y * grid_width + x) and each cell's index in that list,
+            # so food can be placed and cells removed in O(1)
+            num_cells = self.grid_width * self.grid_height
+            self._free_cells = list(range(num_cells))
+            self._free_pos = list(range(num_cells))
+            
+            for x, y in self.snake:
+                self._occupy(x, y)
+        else:
+            # The compiled core keeps its own free-cell list, skip the Python one
+            self._free_cells = None
+            for x, y in self.snake:
+                self.occupied[y, x] = 1
         
         # Initial score and food
         self.score = 0
-        self.food = None
         self._place_food()
         
         # Initial game over state
@@ -60,18 +158,61 @@ class SnakeGame:
         # Frame iteration (can be used to limit game length)
         self.frame_iteration = 0
         
+        # Force a full redraw on the next frame
+        if self.render:
+            self._drawn_frame = None
+        
+        if self._core is not None:
+            self._core.load(self.occupied, self.snake, self.food_x, self.food_y, self.snake_direction.value)
+        
         return self._get_state()
     
+    def _occupy(self, x, y):
+        """Mark the cell (x, y) as part of the snake."""
+        self.occupied[y, x] = 1
+        
+        # Swap the cell with the last free cell and drop it
+        cell = y * self.grid_width + x
+        free_cells = self._free_cells
+        pos = self._free_pos[cell]
+        last = free_cells.pop()
+        if last != cell:
+            free_cells[pos] = last
+            self._free_pos[last] = pos
+    
+    def _release(self, x, y):
+        """Mark the cell (x, y) as free."""
+        self.occupied[y, x] = 0
+        
+        cell = y * self.grid_width + x
+        self._free_pos[cell] = len(self._free_cells)
+        self._free_cells.append(cell)
+    
     def _place_food(self):
         """
         Place a new food item at a random position on the grid not occupied by the snake
+        
+        Returns:
+            bool: False if the snake fills the whole grid (game won)
         """
-        while True:
-            x = random.randint(0, self.grid_width - 1)
-            y = random.randint(0, self.grid_height - 1)
-            self.food = [x, y]
-            if self.food not in self.snake:
-                break
+        if self._free_cells is None:
+            # Compiled core path, only the first food of a game is placed here,
+            # so rejection sampling on the nearly empty board is enough
+            num_cells = self.grid_width * self.grid_height
+            while True:
+                self.food_y, self.food_x = divmod(int(self._rng.integers(num_cells)), self.grid_width)
+                if not self.occupied[self.food_y, self.food_x]:
+                    return True
+        
+        if not self._free_cells:
+            self.food_x = self.food_y = -1
+            return False
+        
+        if not self._uniforms:
+            self._uniforms = self._rng.random(self._RANDOM_BLOCK).tolist()
+        cell = self._free_cells[int(self._uniforms.pop() * len(self._free_cells))]
+        self.food_y, self.food_x = divmod(cell, self.grid_width)
+        return True
 
 
     def debug_print(self):
@@ -80,8 +221,8 @@ class SnakeGame:
         """
         board = [["." for _ in range(self.grid_width)] for _ in range(self.grid_height)]
         
-        if self.food:
-            board[self.food[1]][self.food[0]] = "F"
+        if self.food_x >= 0:
+            board[self.food_y][self.food_x] = "F"
         
         for i, seg in enumerate(self.snake):
             if i == 0:
@@ -96,24 +237,51 @@ class SnakeGame:
         print('+' + '-' * self.grid_width + '+')
         print(f"Score: {self.score}, Length: {len(self.snake)}, Direction: {self.snake_direction.name}")
     
-    def step(self, action):
+    def step(self, action, packed=False):
         """
         Update the game state based on the provided action.
         
         Args:
             action (int): 0 = RIGHT, 1 = DOWN, 2 = LEFT, 3 = UP
+            packed (bool): Return the state as the int from get_state_bits
         
         Returns:
-            state (np.array): The new state
+            state (np.array or int): The new state
             reward (float): The reward for this step
             done (bool): Whether the game is over
             info (dict): Additional information (score)
         """
+        reward, done = self._advance(action)
+        if packed:
+            state = self.get_state_bits()
+        elif self._core is not None:
+            state = self._core.state.copy()
+        else:
+            state = self._get_state()
+        return state, reward, done, {'score': self.score}
+    
+    def _advance(self, action, validated=False):
+        """
+        Update the game state without building the observation.
+        
+        Args:
+            action (int): 0 = RIGHT, 1 = LEFT, 2 = UP, 3 = DOWN
+            validated (bool): Whether the caller already checked 0 <= action <= 3
+        
+        Returns:
+            tuple: (reward, done)
+        """
         # Update frame iteration
         self.frame_iteration += 1
         
+        if self._core is not None:
+            return self._advance_core(action)
+        
+        # Only draw on every render_every-th frame
+        render_frame = self.render and self.frame_iteration % self.render_every == 0
+        
         # Process game events (allows for window closing)
-        if self.render:
+        if render_frame:
             # Process only QUIT events, keep other events for main loop
             for event in pygame.event.get(pygame.QUIT):
                 if event.type == pygame.QUIT:
@@ -122,96 +290,131 @@ class SnakeGame:
             pygame.event.pump()
         
         # Move snake based on the action
-        self._move(action)
-        self.snake.insert(0, self.head.copy())
+        if validated:
+            self._fast_move(action)
+        else:
+            self._move(action)
+        collision = self._is_collision()
+        self.snake.appendleft((self.hx, self.hy))
+        if not collision:
+            self._occupy(self.hx, self.hy)
         
         # Initialize reward
         reward = 0
         done = False
         
         # Check if game over (collision or timeout)
-        if self._is_collision() or self.frame_iteration > 100 * len(self.snake):
+        if collision or self.frame_iteration > 100 * len(self.snake):
             done = True
             reward = -10
-            return self._get_state(), reward, done, {'score': self.score}
+            return reward, done
         
         # Check if snake ate food
-        if self.head == self.food:
+        if self.hx == self.food_x and self.hy == self.food_y:
             self.score += 1
             reward = 10
-            self._place_food()
+            if not self._place_food():
+                # Snake fills the whole grid
+                done = True
         else:
             # Remove the last segment of the snake (unless it just ate)
-            self.snake.pop()
+            self._release(*self.snake.pop())
         
         # Update UI if rendering is enabled
-        if self.render:
+        if render_frame:
             self._update_ui()
-            self.clock.tick(30)  # Adjust speed here
+            self.clock.tick(self.fps)
         
         # Small negative reward to encourage efficiency
         if reward == 0:
             reward = -0.01
         
-        return self._get_state(), reward, done, {'score': self.score}
+        return reward, done
+    
+    def _advance_core(self, action):
+        """
+        Headless update through the compiled SnakeCore. The core shares the
+        occupancy grid; the remaining game attributes are mirrored from it.
+        """
+        core = self._core
+        reward, done, ate = core.step(action, self.frame_iteration)
+        
+        self.snake_direction = self._DIRECTIONS[core.direction]
+        self.hx, self.hy = core.head
+        self.snake.appendleft((self.hx, self.hy))
+        if ate:
+            self.score += 1
+            self.food_x, self.food_y = core.food_x, core.food_y
+        elif not done:
+            self.snake.pop()
+        
+        return reward, done
     
     def _is_collision(self):
-        """Check if the snake has collided with a wall or itself."""
+        """
+        Check if the snake has collided with a wall or itself.
+        Must be called before the new head is marked in the occupancy grid.
+        """
         # Hit boundary
         if (
-            self.head[0] >= self.grid_width or self.head[0] < 0 or
-            self.head[1] >= self.grid_height or self.head[1] < 0
+            self.hx >= self.grid_width or self.hx < 0 or
+            self.hy >= self.grid_height or self.hy < 0
         ):
             return True
         
-        # Hit itself (check if head position is in the rest of the body)
-        if self.head in self.snake[1:]:
-            return True
-        
-        return False
+        # Hit itself (head moved onto a cell still occupied by the body)
+        return bool(self.occupied[self.hy, self.hx])
     
     def _update_ui(self):
-        """Update the game display."""
+        """
+        Update the game display. When exactly one plain move happened since
+        the last frame, only the new head and the old tail cells are redrawn.
+        """
         if not self.render:
             return
-            
+        
+        gs = self.grid_size
+        
+        # Incremental update: erase the old tail and draw the new head
+        if (
+            self._drawn_frame is not None and
+            self.frame_iteration == self._drawn_frame + 1 and
+            self.score == self._last_score and
+            len(self.snake) == self._drawn_length
+        ):
+            tail_rect = pygame.Rect(self._drawn_tail[0] * gs, self._drawn_tail[1] * gs, gs, gs)
+            head_rect = pygame.Rect(self.snake[0][0] * gs, self.snake[0][1] * gs, gs, gs)
+            score_rect = self._score_surface.get_rect()
+            if not (tail_rect.colliderect(score_rect) or head_rect.colliderect(score_rect)):
+                self.display.fill((0, 0, 0), tail_rect)
+                self.display.blit(self._snake_tile, head_rect)
+                self._mark_drawn()
+                pygame.display.update([tail_rect, head_rect])
+                return
+        
         self.display.fill((0, 0, 0))  # Black background
         
         # Draw snake
-        for pt in self.snake:
-            pygame.draw.rect(
-                self.display, (0, 255, 0),  # Green snake
-                pygame.Rect(
-                    pt[0] * self.grid_size, pt[1] * self.grid_size,
-                    self.grid_size, self.grid_size
-                )
-            )
-            
-            # Draw a darker green border around snake segments
-            pygame.draw.rect(
-                self.display, (0, 200, 0),  # Darker green
-                pygame.Rect(
-                    pt[0] * self.grid_size, pt[1] * self.grid_size,
-                    self.grid_size, self.grid_size
-                ), 1  # Width=1 for just the border
-            )
+        self.display.blits([(self._snake_tile, (x * gs, y * gs)) for x, y in self.snake], doreturn=False)
         
         # Draw food
-        pygame.draw.rect(
-            self.display, (255, 0, 0),  # Red food
-            pygame.Rect(
-                self.food[0] * self.grid_size, self.food[1] * self.grid_size,
-                self.grid_size, self.grid_size
-            )
-        )
+        self.display.blit(self._food_tile, (self.food_x * gs, self.food_y * gs))
         
         # Display score
-        font = pygame.font.SysFont('arial', 25)
-        text = font.render(f"Score: {self.score}", True, (255, 255, 255))
-        self.display.blit(text, [0, 0])
+        if self.score != self._last_score:
+            self._score_surface = self._font_score.render(f"Score: {self.score}", True, (255, 255, 255))
+            self._last_score = self.score
+        self.display.blit(self._score_surface, [0, 0])
         
+        self._mark_drawn()
         pygame.display.flip()
     
+    def _mark_drawn(self):
+        """Remember what the display shows, for incremental updates."""
+        self._drawn_frame = self.frame_iteration
+        self._drawn_tail = self.snake[-1]
+        self._drawn_length = len(self.snake)
+    
     def _draw_game_over(self):
         """Draw the game over overlay."""
         if not self.render:
@@ -223,23 +426,22 @@ class SnakeGame:
         self.display.blit(overlay, (0, 0))
         
         # Game Over Text
-        font = pygame.font.SysFont('arial', 50)
-        text = font.render("GAME OVER", True, (255, 0, 0)) # Red
+        text = self._font_over.render("GAME OVER", True, (255, 0, 0)) # Red
         text_rect = text.get_rect(center=(self.width / 2, self.height / 2 - 50))
         self.display.blit(text, text_rect)
         
         # Final Score Text
-        font = pygame.font.SysFont('arial', 30)
-        score_text = font.render(f"Final Score: {self.score}", True, (255, 255, 255)) # White
+        score_text = self._font_final.render(f"Final Score: {self.score}", True, (255, 255, 255)) # White
         score_rect = score_text.get_rect(center=(self.width / 2, self.height / 2))
         self.display.blit(score_text, score_rect)
 
         # Restart Text
-        font = pygame.font.SysFont('arial', 25)
-        restart_text = font.render("Press 'R' to Restart", True, (255, 255, 255)) # White
+        restart_text = self._font_restart.render("Press 'R' to Restart", True, (255, 255, 255)) # White
         restart_rect = restart_text.get_rect(center=(self.width / 2, self.height / 2 + 50))
         self.display.blit(restart_text, restart_rect)
         
+        # The overlay covers the board, so the next frame must redraw everything
+        self._drawn_frame = None
         pygame.display.flip()
     
     def _move(self, action):
@@ -249,85 +451,71 @@ class SnakeGame:
         Args:
             action (int): 0 = RIGHT, 1 = LEFT, 2 = UP, 3 = DOWN
         """
-        # Map actions to Directions and define opposites
-        # Action: 0=RIGHT, 1=LEFT, 2=UP, 3=DOWN
-        directions = [Direction.RIGHT, Direction.LEFT, Direction.UP, Direction.DOWN]
-        opposites = { 
-            Direction.RIGHT: Direction.LEFT,
-            Direction.LEFT: Direction.RIGHT,
-            Direction.UP: Direction.DOWN,
-            Direction.DOWN: Direction.UP
-        }
-        
         if 0 <= action <= 3:
-            new_direction = directions[action]
-            current_direction = self.snake_direction
-            
-            # Prevent 180-degree turns
-            if new_direction != opposites[current_direction]:
-                self.snake_direction = new_direction
+            self._fast_move(action)
+        else:
+            # Keep going in the current direction
+            self._fast_move(self.snake_direction.value)
+    
+    def _fast_move(self, action):
+        """
+        Same as _move, for callers that already checked 0 <= action <= 3.
+        
+        Args:
+            action (int): 0 = RIGHT, 1 = LEFT, 2 = UP, 3 = DOWN
+        """
+        if action != self._OPPOSITE[self.snake_direction.value]:
+            # Not a 180-degree turn
+            self.snake_direction = self._DIRECTIONS[action]
 
         # Update head position based on the potentially updated direction
-        x, y = self.head
-        if self.snake_direction == Direction.RIGHT:
-            x += 1
-        elif self.snake_direction == Direction.LEFT:
-            x -= 1
-        elif self.snake_direction == Direction.DOWN:
-            y += 1
-        elif self.snake_direction == Direction.UP:
-            y -= 1
-        
-        self.head = [x, y]
+        dx, dy = self._DELTAS[self.snake_direction.value]
+        self.hx += dx
+        self.hy += dy
     
+    def _is_danger(self, x, y):
+        """Check if the cell (x, y) is out of bounds or occupied by the snake."""
+        if x < 0 or x >= self.grid_width or y < 0 or y >= self.grid_height:
+            return True
+        return bool(self.occupied[y, x])
+
+    def get_state_bits(self):
+        """
+        Get the state representation packed into a single integer.
+        
+        Bit i holds feature i of the state vector returned by _get_state,
+        so the value can be used directly as a key by tabular agents.
+        
+        Returns:
+            int: The state representation as a 12-bit mask
+        """
+        head_x, head_y = self.hx, self.hy
+        food_x, food_y = self.food_x, self.food_y
+        is_danger = self._is_danger
+        
+        return (
+            # Danger in each direction (right, down, left, up)
+            is_danger(head_x + 1, head_y)
+            | is_danger(head_x, head_y + 1) << 1
+            | is_danger(head_x - 1, head_y) << 2
+            | is_danger(head_x, head_y - 1) << 3
+            # Current direction as a one-hot encoding
+            | 1 << (4 + self.snake_direction.value)
+            # Food direction (right, down, left, up)
+            | (food_x > head_x) << 8
+            | (food_y > head_y) << 9
+            | (food_x < head_x) << 10
+            | (food_y < head_y) << 11
+        )
+
     def _get_state(self):
         """
         Get the state representation for the RL agent.
         
         Returns:
-            np.array: The state representation (12 binary values)
-        """
-        head_x, head_y = self.head
-        
-        # Create points for checking danger
-        points_relative = [
-            [1, 0],   # Right
-            [0, 1],   # Down
-            [-1, 0],  # Left
-            [0, -1]   # Up
-        ]
-        
-        danger = [False, False, False, False]  # Danger in each direction
-        
-        # Check for danger in each direction
-        for i, (dx, dy) in enumerate(points_relative):
-            point = [head_x + dx, head_y + dy]
-            # Check if point is out of bounds
-            if (
-                point[0] >= self.grid_width or point[0] < 0 or
-                point[1] >= self.grid_height or point[1] < 0
-            ):
-                danger[i] = True
-            # Check if point is on snake body
-            elif point in self.snake[1:]:
-                danger[i] = True
-        
-        # Current direction as a one-hot encoding
-        dir_one_hot = [0, 0, 0, 0]
-        dir_one_hot[self.snake_direction.value] = 1
-        
-        # Food direction
-        food_dir = [
-            self.food[0] > head_x,  # Food is to the right
-            self.food[1] > head_y,  # Food is down
-            self.food[0] < head_x,  # Food is to the left
-            self.food[1] < head_y   # Food is up
-        ]
-        
-        # Combine all state features
-        state = danger + dir_one_hot + food_dir
-        
-        return np.array(state, dtype=int)
+            np.array: The state representation (12 binary values, int8)
+        """
+        return _STATE_TABLE[self.get_state_bits()].copy()
 
     def get_action_space(self):
         """
@@ -355,6 +543,7 @@ class SnakeGame:
         """
         return {
             'shape': (12,),  # 4 danger values + 4 direction values + 4 food direction values
+            'dtype': np.int8,  # Cast to float32 before feeding a network
             'features': {
                 'danger': 'Binary values indicating danger in RIGHT, DOWN, LEFT, UP directions',
                 'direction': 'One-hot encoding of current direction (RIGHT, DOWN, LEFT, UP)',
@@ -367,8 +556,9 @@ class SnakeEnv:
     A wrapper for the SnakeGameAI that follows the Gym-like interface.
     This makes it easier to use with RL libraries.
     """
-    def __init__(self, width=640, height=480, grid_size=20, render=True):
-        self.game = SnakeGame(width, height, grid_size, render)
+    def __init__(self, width=640, height=480, grid_size=20, render=True, render_every=1, fps=30,
+                 seed=None):
+        self.game = SnakeGame(width, height, grid_size, render, render_every, fps, seed)
         self.action_space = self.game.get_action_space()
         self.observation_space = self.game.get_state_space()
     
@@ -378,17 +568,18 @@ class SnakeEnv:
         """
         return self.game.reset()
     
-    def step(self, action):
+    def step(self, action, packed=False):
         """
         Take a step in the game
         
         Args:
             action (int): The action to take
+            packed (bool): Return the observation as a 12-bit int
         
         Returns:
             tuple: (observation, reward, done, info)
         """
-        return self.game.step(action)
+        return self.game.step(action, packed)
     
     def render(self):
         """
@@ -405,6 +596,223 @@ class SnakeEnv:
             pygame.quit()
     
 
+def _shared_views(shared, num_envs, grid_height, grid_width):
+    """
+    Wrap the shared arrays of a VecSnakeEnv as NumPy arrays.
+    
+    Returns:
+        tuple: (grids, heads, dirs, foods)
+    """
+    grids, heads, dirs, foods = shared
+    return (
+        np.frombuffer(grids, dtype=np.uint8).reshape(num_envs, grid_height, grid_width),
+        np.frombuffer(heads, dtype=np.int16).reshape(num_envs, 2),
+        np.frombuffer(dirs, dtype=np.int8),
+        np.frombuffer(foods, dtype=np.int16).reshape(num_envs, 2)
+    )
+
+
+def _vec_worker(remote, parent_remote, shared, index, num_envs, width, height, grid_size, seed):
+    """
+    Worker process loop for VecSnakeEnv. Owns one headless SnakeGame whose
+    occupancy grid is row `index` of the shared grids, and publishes the
+    head, direction and food positions after every update.
+    """
+    parent_remote.close()
+    game = SnakeGame(width, height, grid_size, render=False, seed=seed)
+    grids, heads, dirs, foods = _shared_views(shared, num_envs, game.grid_height, game.grid_width)
+    game.occupied = grids[index]
+
+    def publish():
+        heads[index] = (game.hx, game.hy)
+        dirs[index] = game.snake_direction.value
+        foods[index] = (game.food_x, game.food_y)
+
+    game.reset()
+    publish()
+
+    try:
+        while True:
+            cmd, data = remote.recv()
+            if cmd == 'step':
+                reward, done = game._advance(data, validated=True)
+                info = {'score': game.score}
+                # Auto-reset, keeping the final state available to the caller
+                if done:
+                    info['terminal_observation'] = game._get_state()
+                    game.reset()
+                publish()
+                remote.send((reward, done, info))
+            elif cmd == 'reset':
+                game.reset()
+                publish()
+                remote.send(None)
+            elif cmd == 'close':
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        remote.close()
+
+
+class VecSnakeEnv:
+    """
+    Runs several headless SnakeGames in worker processes and steps them together.
+    The games' grids, heads, directions and food positions live in shared
+    memory, so only rewards, done flags and infos are sent through the pipes
+    and the observations for all games are built in one vectorized pass.
+    Finished games are reset automatically, and their last state is stored
+    in info['terminal_observation'].
+    """
+    # Neighbour offsets (x, y) for the danger features: right, down, left, up
+    _OFFSETS = np.array([[1, 0], [0, 1], [-1, 0], [0, -1]])
+    
+    # One-hot direction rows indexed by Direction.value
+    _DIR_ONE_HOT = np.eye(4, dtype=np.int8)
+
+    def __init__(self, num_envs, width=640, height=480, grid_size=20, start_method=None, seed=None):
+        self.num_envs = num_envs
+        self.waiting = False
+        self.closed = False
+
+        # Spaces are the same for every game, so read them from a local instance
+        game = SnakeGame(width, height, grid_size, render=False, use_core=False)
+        self.action_space = game.get_action_space()
+        self.observation_space = game.get_state_space()
+        self.grid_width = game.grid_width
+        self.grid_height = game.grid_height
+
+        ctx = multiprocessing.get_context(start_method)
+        self._shared = (
+            ctx.RawArray('B', num_envs * self.grid_height * self.grid_width),
+            ctx.RawArray('h', num_envs * 2),
+            ctx.RawArray('b', num_envs),
+            ctx.RawArray('h', num_envs * 2)
+        )
+        self._grids, self._heads, self._dirs, self._foods = _shared_views(
+            self._shared, num_envs, self.grid_height, self.grid_width
+        )
+
+        # Independent child seeds, so games differ but the batch is reproducible
+        seeds = np.random.SeedSequence(seed).spawn(num_envs)
+
+        self.remotes, work_remotes = zip(*[ctx.Pipe() for _ in range(num_envs)])
+        self.processes = []
+        for i, (work_remote, remote) in enumerate(zip(work_remotes, self.remotes)):
+            process = ctx.Process(
+                target=_vec_worker,
+                args=(work_remote, remote, self._shared, i, num_envs, width, height, grid_size, seeds[i]),
+                daemon=True
+            )
+            process.start()
+            self.processes.append(process)
+            work_remote.close()
+
+    def _get_states(self):
+        """
+        Build the observations of all games at once (see SnakeGame._get_state).
+        
+        Returns:
+            np.array: The states, shape (num_envs, 12)
+        """
+        h, w = self.grid_height, self.grid_width
+        heads = self._heads
+        
+        # Neighbouring points of every head, shape (num_envs, 4, 2)
+        neighbors = heads[:, None, :] + self._OFFSETS[None, :, :]
+        xs = neighbors[..., 0]
+        ys = neighbors[..., 1]
+        oob = (xs < 0) | (xs >= w) | (ys < 0) | (ys >= h)
+        body = self._grids[
+            np.arange(self.num_envs)[:, None], ys.clip(0, h - 1), xs.clip(0, w - 1)
+        ] != 0
+        
+        states = np.empty((self.num_envs, 12), dtype=np.int8)
+        states[:, 0:4] = oob | body
+        states[:, 4:8] = self._DIR_ONE_HOT[self._dirs]
+        # Food to the right / down, then to the left / up
+        states[:, 8:10] = self._foods > heads
+        states[:, 10:12] = self._foods < heads
+        return states
+
+    def reset(self):
+        """
+        Reset all games and return the initial observations
+        
+        Returns:
+            np.array: The states, shape (num_envs, 12)
+        """
+        for remote in self.remotes:
+            remote.send(('reset', None))
+        for remote in self.remotes:
+            remote.recv()
+        return self._get_states()
+
+    def step_async(self, actions):
+        """
+        Send one action to every game without waiting for the results
+        
+        Args:
+            actions (array-like): One action per game, each in 0..3
+        """
+        # Validate the whole batch once so the workers can skip the check
+        actions = np.asarray(actions)
+        if actions.shape != (self.num_envs,):
+            raise ValueError(f"Expected {self.num_envs} actions, got shape {actions.shape}")
+        if not np.issubdtype(actions.dtype, np.integer):
+            raise ValueError(f"Actions must be integers, got dtype {actions.dtype}")
+        if ((actions < 0) | (actions > 3)).any():
+            raise ValueError(f"Actions must be in 0..3, got {actions}")
+        for remote, action in zip(self.remotes, actions.tolist()):
+            remote.send(('step', action))
+        self.waiting = True
+
+    def step_wait(self):
+        """
+        Wait for the actions sent by step_async to finish
+        
+        Returns:
+            tuple: (observations, rewards, dones, infos) batched over the games
+        """
+        results = [remote.recv() for remote in self.remotes]
+        self.waiting = False
+        rewards, dones, infos = zip(*results)
+        return (
+            self._get_states(),
+            np.array(rewards, dtype=np.float32),
+            np.array(dones, dtype=bool),
+            list(infos)
+        )
+
+    def step(self, actions):
+        """
+        Take a step in every game
+        
+        Args:
+            actions (array-like): One action per game
+        
+        Returns:
+            tuple: (observations, rewards, dones, infos) batched over the games
+        """
+        self.step_async(actions)
+        return self.step_wait()
+
+    def close(self):
+        """
+        Stop the worker processes
+        """
+        if self.closed:
+            return
+        if self.waiting:
+            for remote in self.remotes:
+                remote.recv()
+        for remote in self.remotes:
+            remote.send(('close', None))
+        for process in self.processes:
+            process.join()
+        self.closed = True
+
+
 # Example of usage
 def main():
     human_mode = True  # Set to False for AI mode
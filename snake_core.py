@@ -0,0 +1,284 @@
+"""
+Compiled core of the headless snake game.
+
+The per-step logic (move, collision, food placement and state) works on
+plain NumPy arrays so it can be compiled with Numba (NumbaSnakeCore). If
+the Cython build of snake_core_cy.pyx is available, SnakeCore is that class
+instead.
+SnakeGame routes its render=False path through SnakeCore when HAVE_CORE.
+"""
+import os
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """Fallback decorator used when Numba is not installed."""
+        return lambda func: func
+
+
+# Head movement (x, y) indexed by direction: RIGHT, LEFT, UP, DOWN
+_DELTAS = np.array([[1, 0], [-1, 0], [0, -1], [0, 1]], dtype=np.int64)
+
+# Opposite of each direction, used to block 180-degree turns
+_OPPOSITE = np.array([1, 0, 3, 2], dtype=np.int64)
+
+# Neighbour offsets (x, y) for the danger features: right, down, left, up
+_OFFSETS = np.array([[1, 0], [0, 1], [-1, 0], [0, -1]], dtype=np.int64)
+
+@njit(cache=True)
+def next_random(rng):
+    """
+    Advance the xorshift64 generator whose state is rng[0] (uint64, non-zero).
+    Each core keeps its own state, unlike Numba's process-wide np.random.
+    """
+    x = rng[0]
+    x ^= x << np.uint64(13)
+    x ^= x >> np.uint64(7)
+    x ^= x << np.uint64(17)
+    rng[0] = x
+    return x
+
+
+@njit(cache=True)
+def build_free_cells(occupied, free_cells, free_pos, free_count):
+    """
+    Fill the free-cell list from the occupancy grid. free_cells[:free_count[0]]
+    holds the free cells (y * grid_width + x), free_pos maps a cell to its index.
+    """
+    grid_height, grid_width = occupied.shape
+    count = 0
+    for cell in range(grid_width * grid_height):
+        if occupied[cell // grid_width, cell % grid_width] == 0:
+            free_cells[count] = cell
+            free_pos[cell] = count
+            count += 1
+    free_count[0] = count
+
+
+@njit(cache=True)
+def occupy(occupied, free_cells, free_pos, free_count, x, y):
+    """Mark the cell (x, y) as part of the snake."""
+    occupied[y, x] = 1
+
+    # Swap the cell with the last free cell and drop it
+    cell = y * occupied.shape[1] + x
+    pos = free_pos[cell]
+    last = free_cells[free_count[0] - 1]
+    free_cells[pos] = last
+    free_pos[last] = pos
+    free_count[0] -= 1
+
+
+@njit(cache=True)
+def release(occupied, free_cells, free_pos, free_count, x, y):
+    """Mark the cell (x, y) as free."""
+    occupied[y, x] = 0
+
+    cell = y * occupied.shape[1] + x
+    free_cells[free_count[0]] = cell
+    free_pos[cell] = free_count[0]
+    free_count[0] += 1
+
+
+@njit(cache=True)
+def place_food(free_cells, free_count, grid_width, rng):
+    """
+    Pick a random free cell for the food.
+
+    Returns:
+        tuple: (x, y) of the food, or (-1, -1) if the board is full
+    """
+    if free_count[0] == 0:
+        return -1, -1
+    cell = np.int64(free_cells[np.int64(next_random(rng) % np.uint64(free_count[0]))])
+    return cell % grid_width, cell // grid_width
+
+
+@njit(cache=True)
+def write_state(occupied, head_x, head_y, direction, food_x, food_y, state_out):
+    """
+    Write the 12 binary state features into state_out (see SnakeGame._get_state).
+    """
+    grid_height, grid_width = occupied.shape
+
+    # Danger in each direction (right, down, left, up)
+    for i in range(4):
+        x = head_x + _OFFSETS[i, 0]
+        y = head_y + _OFFSETS[i, 1]
+        if x < 0 or x >= grid_width or y < 0 or y >= grid_height:
+            state_out[i] = 1
+        else:
+            state_out[i] = occupied[y, x] != 0
+
+    # Current direction as a one-hot encoding
+    for i in range(4):
+        state_out[4 + i] = 0
+    state_out[4 + direction] = 1
+
+    # Food direction (right, down, left, up)
+    state_out[8] = food_x > head_x
+    state_out[9] = food_y > head_y
+    state_out[10] = food_x < head_x
+    state_out[11] = food_y < head_y
+
+
+@njit(cache=True)
+def core_step(occupied, body, free_cells, free_pos, free_count, rng, head_idx, length,
+              direction, action, food_x, food_y, frame_iteration, state_out):
+    """
+    Advance the game by one step.
+
+    Args:
+        occupied (np.array): uint8 occupancy grid, indexed [y, x]
+        body (np.array): int16 ring buffer of (x, y) segments
+        free_cells (np.array): Free cells, the first free_count[0] are valid
+        free_pos (np.array): Index of each free cell in free_cells
+        free_count (np.array): int64[1] number of free cells
+        rng (np.array): uint64[1] xorshift64 state used for food placement
+        head_idx (int): Index of the head in body
+        length (int): Number of segments in body
+        direction (int): Current direction (Direction.value)
+        action (int): 0 = RIGHT, 1 = LEFT, 2 = UP, 3 = DOWN
+        food_x (int): Food column
+        food_y (int): Food row
+        frame_iteration (int): Frame counter, already incremented for this step
+        state_out (np.array): int8 buffer receiving the new state
+
+    Returns:
+        tuple: (reward, done, ate, head_idx, length, direction, food_x, food_y)
+    """
+    grid_height, grid_width = occupied.shape
+    capacity = body.shape[0]
+
+    # Update direction, preventing 180-degree turns
+    if 0 <= action <= 3 and action != _OPPOSITE[direction]:
+        direction = action
+
+    head_x = body[head_idx, 0] + _DELTAS[direction, 0]
+    head_y = body[head_idx, 1] + _DELTAS[direction, 1]
+
+    collision = (
+        head_x < 0 or head_x >= grid_width or
+        head_y < 0 or head_y >= grid_height or
+        occupied[head_y, head_x] != 0
+    )
+
+    # Push the new head onto the ring buffer
+    head_idx -= 1
+    if head_idx < 0:
+        head_idx += capacity
+    body[head_idx, 0] = head_x
+    body[head_idx, 1] = head_y
+    length += 1
+    if not collision:
+        occupy(occupied, free_cells, free_pos, free_count, head_x, head_y)
+
+    ate = False
+    done = False
+    if collision or frame_iteration > 100 * length:
+        done = True
+        reward = -10.0
+    elif head_x == food_x and head_y == food_y:
+        ate = True
+        reward = 10.0
+        food_x, food_y = place_food(free_cells, free_count, grid_width, rng)
+        # Snake fills the whole grid
+        done = food_x < 0
+    else:
+        # Remove the last segment of the snake
+        tail_idx = (head_idx + length - 1) % capacity
+        release(occupied, free_cells, free_pos, free_count,
+                np.int64(body[tail_idx, 0]), np.int64(body[tail_idx, 1]))
+        length -= 1
+        reward = -0.01
+
+    write_state(occupied, head_x, head_y, direction, food_x, food_y, state_out)
+    return reward, done, ate, head_idx, length, direction, food_x, food_y
+
+
+class NumbaSnakeCore:
+    """
+    Headless game state held in arrays and advanced by core_step.
+    The occupancy grid is shared with the owning SnakeGame.
+    """
+    def __init__(self, grid_width, grid_height, seed=None):
+        # One extra slot for the head pushed on the final (colliding) step
+        self.body = np.empty((grid_width * grid_height + 1, 2), dtype=np.int16)
+        # Swap-delete list of free cells, so food placement is O(1)
+        self.free_cells = np.empty(grid_width * grid_height, dtype=np.int32)
+        self.free_pos = np.empty(grid_width * grid_height, dtype=np.int32)
+        self.free_count = np.zeros(1, dtype=np.int64)
+        self.state = np.zeros(12, dtype=np.int8)
+        self.occupied = None
+        self.head_idx = 0
+        self.length = 0
+        self.direction = 0
+        self.food_x = 0
+        self.food_y = 0
+        # Without a seed, use the OS so that cores in forked worker processes
+        # don't share a sequence
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), 'little')
+        # xorshift64 state must be non-zero
+        self.rng = np.array([(seed & 0xFFFFFFFFFFFFFFFF) | 1], dtype=np.uint64)
+
+    def load(self, occupied, snake, food_x, food_y, direction):
+        """
+        Load the state of a freshly reset game.
+
+        Args:
+            occupied (np.array): The game's occupancy grid
+            snake (iterable): (x, y) segments, starting with the head
+            food_x (int): Food column
+            food_y (int): Food row
+            direction (int): Current direction (Direction.value)
+        """
+        self.occupied = occupied
+        self.head_idx = 0
+        self.length = 0
+        for x, y in snake:
+            self.body[self.length] = (x, y)
+            self.length += 1
+        build_free_cells(occupied, self.free_cells, self.free_pos, self.free_count)
+        self.food_x = food_x
+        self.food_y = food_y
+        self.direction = direction
+
+    @property
+    def head(self):
+        """The (x, y) position of the head."""
+        return int(self.body[self.head_idx, 0]), int(self.body[self.head_idx, 1])
+
+    def step(self, action, frame_iteration):
+        """
+        Advance the game by one step, writing the new state into self.state.
+
+        Returns:
+            tuple: (reward, done, ate)
+        """
+        (reward, done, ate, self.head_idx, self.length, self.direction,
+         self.food_x, self.food_y) = core_step(
+            self.occupied, self.body, self.free_cells, self.free_pos, self.free_count,
+            self.rng, self.head_idx, self.length, self.direction,
+            action, self.food_x, self.food_y, frame_iteration, self.state
+        )
+        return reward, done, ate
+
+
+# Prefer the ahead-of-time compiled core when it has been built
+try:
+    from snake_core_cy import SnakeCore as _CySnakeCore
+except ImportError:
+    _CySnakeCore = None
+
+if _CySnakeCore is not None:
+    SnakeCore = _CySnakeCore
+else:
+    SnakeCore = NumbaSnakeCore
+HAVE_CORE = _CySnakeCore is not None or HAVE_NUMBA
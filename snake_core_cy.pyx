@@ -0,0 +1,222 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Ahead-of-time compiled core of the headless snake game.
+
+Drop-in replacement for snake_core.SnakeCore that does not need Numba or a
+JIT warmup. snake_core picks it up automatically once it is built in place:
+
+    cythonize -i snake_core_cy.pyx
+"""
+import os
+
+import numpy as np
+
+# Head movement indexed by direction: RIGHT, LEFT, UP, DOWN
+cdef int DELTA_X[4]
+cdef int DELTA_Y[4]
+DELTA_X[:] = [1, -1, 0, 0]
+DELTA_Y[:] = [0, 0, -1, 1]
+
+# Opposite of each direction, used to block 180-degree turns
+cdef int OPPOSITE[4]
+OPPOSITE[:] = [1, 0, 3, 2]
+
+cdef class SnakeCore:
+    """
+    Headless game state held in C buffers and advanced by step.
+    The occupancy grid is shared with the owning SnakeGame.
+    """
+    cdef readonly object occupied
+    cdef readonly object state
+    cdef readonly int head_idx
+    cdef readonly int length
+    cdef readonly int direction
+    cdef readonly int food_x
+    cdef readonly int food_y
+
+    cdef unsigned char[:, ::1] _occupied
+    cdef short[::1] _body_x
+    cdef short[::1] _body_y
+    cdef int[::1] _free_cells
+    cdef int[::1] _free_pos
+    cdef int _free_count
+    cdef signed char[::1] _state
+    cdef int grid_width
+    cdef int grid_height
+    cdef int capacity
+    cdef unsigned long long _rng
+
+    def __init__(self, int grid_width, int grid_height, seed=None):
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        # One extra slot for the head pushed on the final (colliding) step
+        self.capacity = grid_width * grid_height + 1
+        self._body_x = np.empty(self.capacity, dtype=np.int16)
+        self._body_y = np.empty(self.capacity, dtype=np.int16)
+        # Swap-delete list of free cells, so food placement is O(1)
+        self._free_cells = np.empty(grid_width * grid_height, dtype=np.intc)
+        self._free_pos = np.empty(grid_width * grid_height, dtype=np.intc)
+        self.state = np.zeros(12, dtype=np.int8)
+        self._state = self.state
+        # Without a seed, use the OS so that cores in forked worker processes
+        # don't share a sequence
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), 'little')
+        # xorshift64 state must be non-zero
+        self._rng = (seed & 0xFFFFFFFFFFFFFFFF) | 1
+
+    def load(self, occupied, snake, int food_x, int food_y, int direction):
+        """
+        Load the state of a freshly reset game.
+
+        Args:
+            occupied (np.array): The game's occupancy grid
+            snake (iterable): (x, y) segments, starting with the head
+            food_x (int): Food column
+            food_y (int): Food row
+            direction (int): Current direction (Direction.value)
+        """
+        cdef int cell
+
+        self.occupied = occupied
+        self._occupied = occupied
+        self.head_idx = 0
+        self.length = 0
+        for x, y in snake:
+            self._body_x[self.length] = x
+            self._body_y[self.length] = y
+            self.length += 1
+        self.food_x = food_x
+        self.food_y = food_y
+        self.direction = direction
+
+        # Rebuild the free-cell list from the grid
+        self._free_count = 0
+        for cell in range(self.grid_width * self.grid_height):
+            if self._occupied[cell // self.grid_width, cell % self.grid_width] == 0:
+                self._free_cells[self._free_count] = cell
+                self._free_pos[cell] = self._free_count
+                self._free_count += 1
+
+    @property
+    def head(self):
+        """The (x, y) position of the head."""
+        return self._body_x[self.head_idx], self._body_y[self.head_idx]
+
+    cdef inline unsigned long long _random(self):
+        """Next value of the xorshift64 generator."""
+        cdef unsigned long long x = self._rng
+        x ^= x << 13
+        x ^= x >> 7
+        x ^= x << 17
+        self._rng = x
+        return x
+
+    cdef inline void _occupy(self, int x, int y):
+        """Mark the cell (x, y) as part of the snake."""
+        cdef int cell = y * self.grid_width + x
+        cdef int pos = self._free_pos[cell]
+        cdef int last = self._free_cells[self._free_count - 1]
+
+        self._occupied[y, x] = 1
+        # Swap the cell with the last free cell and drop it
+        self._free_cells[pos] = last
+        self._free_pos[last] = pos
+        self._free_count -= 1
+
+    cdef inline void _release(self, int x, int y):
+        """Mark the cell (x, y) as free."""
+        cdef int cell = y * self.grid_width + x
+
+        self._occupied[y, x] = 0
+        self._free_cells[self._free_count] = cell
+        self._free_pos[cell] = self._free_count
+        self._free_count += 1
+
+    cdef bint _place_food(self):
+        """Pick a random free cell for the food, False if the board is full."""
+        cdef int cell
+
+        if self._free_count == 0:
+            self.food_x = self.food_y = -1
+            return False
+        cell = self._free_cells[<int>(self._random() % <unsigned long long>self._free_count)]
+        self.food_x = cell % self.grid_width
+        self.food_y = cell // self.grid_width
+        return True
+
+    cdef inline bint _is_danger(self, int x, int y):
+        """Check if the cell (x, y) is out of bounds or occupied by the snake."""
+        if x < 0 or x >= self.grid_width or y < 0 or y >= self.grid_height:
+            return True
+        return self._occupied[y, x] != 0
+
+    cdef void _write_state(self, int head_x, int head_y):
+        """Write the 12 binary state features (see SnakeGame._get_state)."""
+        cdef int i
+
+        # Danger in each direction (right, down, left, up)
+        self._state[0] = self._is_danger(head_x + 1, head_y)
+        self._state[1] = self._is_danger(head_x, head_y + 1)
+        self._state[2] = self._is_danger(head_x - 1, head_y)
+        self._state[3] = self._is_danger(head_x, head_y - 1)
+
+        # Current direction as a one-hot encoding
+        for i in range(4):
+            self._state[4 + i] = 0
+        self._state[4 + self.direction] = 1
+
+        # Food direction (right, down, left, up)
+        self._state[8] = self.food_x > head_x
+        self._state[9] = self.food_y > head_y
+        self._state[10] = self.food_x < head_x
+        self._state[11] = self.food_y < head_y
+
+    cpdef tuple step(self, int action, long frame_iteration):
+        """
+        Advance the game by one step, writing the new state into self.state.
+
+        Returns:
+            tuple: (reward, done, ate)
+        """
+        cdef int head_x, head_y, tail_idx
+        cdef bint collision
+        cdef bint ate = False
+        cdef bint done = False
+        cdef double reward
+
+        # Update direction, preventing 180-degree turns
+        if 0 <= action <= 3 and action != OPPOSITE[self.direction]:
+            self.direction = action
+
+        head_x = self._body_x[self.head_idx] + DELTA_X[self.direction]
+        head_y = self._body_y[self.head_idx] + DELTA_Y[self.direction]
+        collision = self._is_danger(head_x, head_y)
+
+        # Push the new head onto the ring buffer
+        self.head_idx -= 1
+        if self.head_idx < 0:
+            self.head_idx += self.capacity
+        self._body_x[self.head_idx] = head_x
+        self._body_y[self.head_idx] = head_y
+        self.length += 1
+        if not collision:
+            self._occupy(head_x, head_y)
+
+        if collision or frame_iteration > 100 * self.length:
+            done = True
+            reward = -10.0
+        elif head_x == self.food_x and head_y == self.food_y:
+            ate = True
+            reward = 10.0
+            # Snake fills the whole grid
+            done = not self._place_food()
+        else:
+            # Remove the last segment of the snake
+            tail_idx = (self.head_idx + self.length - 1) % self.capacity
+            self._release(self._body_x[tail_idx], self._body_y[tail_idx])
+            self.length -= 1
+            reward = -0.01
+
+        self._write_state(head_x, head_y)
+        return reward, done, ate